@@ -3,9 +3,10 @@ Configuration Management for TruthLens Backend
 Handles environment variables and AWS configuration
 """
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from dataclasses import make_dataclass
 from functools import lru_cache
-from typing import List
+from typing import List, Tuple
 import os
 
 
@@ -22,11 +23,33 @@ class Settings(BaseSettings):
     # Server Settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WORKERS: int = 1  # One process owns the model (GPU-bound)
     
     # Model Configuration
     MODEL_PATH: str = "/mnt/e/AI ML/PROJECTS/TruthLens Multi-Modal Real-Time Fake News Detection System/Model-Trained/3810/"
     MAX_TEXT_LENGTH: int = 512
     CONFIDENCE_THRESHOLD: float = 0.5
+    MAX_BATCH_SIZE: int = 16
+    BATCH_WAIT_MS: float = 5.0
+    USE_TORCH_COMPILE: bool = True
+    PAD_TO_MULTIPLE_OF: int = 64  # CUDA only: bucket sequence lengths
+    
+    # Explainability
+    XAI_METHOD: str = "integrated_gradients"  # or "shap", "distilled"
+    XAI_HEAD_PATH: str = "attribution_head.pt"  # Distilled SHAP head weights
+    XAI_IG_STEPS: int = 8
+    XAI_BATCH_SIZE: int = 32  # SHAP masked variants per forward pass
+    XAI_SHAP_PERMUTATIONS: int = 3
+    XAI_PROBA_CACHE_SIZE: int = 4096
+    XAI_QUANTIZE: bool = True  # int8 SHAP model on CPU
+    NUMBA_CACHE_DIR: str = ".numba_cache"  # Persistent JIT cache for SHAP's numba helpers
+    XAI_THRESHOLD: float = 0.97  # Above this confidence, skip attribution + Gemini
+    
+    # Result Cache
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_SIZE: int = 4096
+    CACHE_FALLBACK_TTL_SECONDS: int = 60
+    SINGLE_FLIGHT_MAX_KEYS: int = 1024
     
     # Gemini API Configuration
     GEMINI_API_KEY: str = ""
@@ -39,20 +62,26 @@ class Settings(BaseSettings):
     DYNAMODB_TABLE_NAME: str = "TruthLens-Predictions"
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
+    DYNAMODB_QUEUE_SIZE: int = 1000
+    DYNAMODB_FLUSH_INTERVAL_S: float = 0.2
+    DYNAMODB_MAX_RETRIES: int = 3
     
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "truthlens.log"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
     
     # CORS Settings - Use string that will be split
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
     
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        env_nested_delimiter="__",
         # FIX: Disable protected namespaces warning
-        protected_namespaces = ()
+        protected_namespaces=()
+    )
     
     def get_cors_origins(self) -> List[str]:
         """
@@ -61,9 +90,37 @@ class Settings(BaseSettings):
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
 
+def _frozen_cors_origins(self) -> List[str]:
+    """
+    CORS origins precomputed at load time
+    """
+    return list(self.CORS_ORIGINS)
+
+
+# Immutable snapshot of Settings: Pydantic validates once at startup, hot
+# paths then read plain slot attributes instead of model descriptors
+FrozenSettings = make_dataclass(
+    "FrozenSettings",
+    [(name, field.annotation) for name, field in Settings.model_fields.items()]
+    + [("CORS_ORIGINS", Tuple[str, ...])],
+    namespace={"get_cors_origins": _frozen_cors_origins},
+    frozen=True,
+    slots=True
+)
+
+
 @lru_cache()
-def get_settings() -> Settings:
+def get_settings() -> FrozenSettings:
     """
-    Cached settings instance
+    Cached settings instance (validated once, then frozen)
     """
-    return Settings()
+    validated = Settings()
+    return FrozenSettings(
+        **validated.model_dump(),
+        CORS_ORIGINS=tuple(validated.get_cors_origins())
+    )
+
+
+# Process-wide settings, resolved at import time
+# Usage: from app.config import SETTINGS as settings
+SETTINGS = get_settings()
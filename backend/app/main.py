@@ -5,10 +5,12 @@ Entry point for the fake news detection API
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import asyncio
 
-from app.config import get_settings
+from app.config import SETTINGS as settings
 from app.routes import detection
 from app.middleware.error_handler import (
     validation_exception_handler,
@@ -16,10 +18,22 @@ from app.middleware.error_handler import (
 )
 from app.utils.logger import setup_logger
 
-settings = get_settings()
 logger = setup_logger(__name__)
 
 
+async def _preload_model():
+    """
+    Load the model in the background so health checks answer at once
+    and turn healthy when loading finishes
+    """
+    try:
+        await detection.model_service.ensure_loaded()
+        logger.info("✅ Model preloaded")
+    except Exception as e:
+        # /detect retries the load on its next call
+        logger.error(f"❌ Model preload failed: {str(e)}", exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -35,10 +49,14 @@ async def lifespan(app: FastAPI):
     logger.info(f"Model Path: {settings.MODEL_PATH}")
     logger.info("="*70)
     
+    # Background DynamoDB batch writer
+    await detection.dynamodb_service.start()
+    
     try:
-        # Model will be loaded on first request (lazy loading)
+        # Model loads in the background; requests arriving first wait on the same load
+        preload_task = asyncio.create_task(_preload_model())
         logger.info("✅ Backend initialization complete")
-        logger.info("Model will be loaded on first request")
+        logger.info("Model loading in background")
     except Exception as e:
         logger.error(f"❌ Initialization failed: {str(e)}", exc_info=True)
         raise
@@ -47,6 +65,13 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 TruthLens Backend Shutting Down...")
+    preload_task.cancel()
+    try:
+        await preload_task
+    except asyncio.CancelledError:
+        pass
+    await detection.dynamodb_service.stop()
+    await detection.model_service.stop()
     logger.info("✅ Cleanup complete")
 
 
@@ -59,13 +84,14 @@ app = FastAPI(
     
     ## Features
     - 99.3% accurate RoBERTa-based fake news detection
-    - SHAP-based explainability (XAI)
+    - Integrated-gradients explainability (XAI) - SHAP via XAI_METHOD
     - Gemini LLM-generated human-readable explanations
     - DynamoDB prediction logging
     - Comprehensive error handling
     
     ## Endpoints
     - `POST /api/detect` - Detect fake news from title and text
+    - `POST /api/detect/stream` - Same, with the explanation streamed as Server-Sent Events
     - `GET /api/health` - Health check
     
     ## Usage
@@ -80,6 +106,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     debug=settings.DEBUG
 )
 
@@ -108,16 +135,17 @@ async def root():
     """
     Root endpoint - API information
     """
-    return {
+    return ORJSONResponse({
         "message": "TruthLens Fake News Detection API",
         "version": settings.APP_VERSION,
         "status": "operational",
         "docs": "/docs",
         "endpoints": {
             "detect": "POST /api/detect",
+            "detect_stream": "POST /api/detect/stream",
             "health": "GET /api/health"
         }
-    }
+    })
 
 
 if __name__ == "__main__":
@@ -130,5 +158,10 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        workers=settings.WORKERS,
+        # uvloop/httptools when installed (uvloop is not available on Windows)
+        loop="auto",
+        http="auto",
+        access_log=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower()
     )
@@ -5,10 +5,11 @@ Global Error Handler Middleware
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from datetime import datetime
+import logging
 import traceback
 
 from app.utils.logger import setup_logger
+from app.utils.timestamps import iso_now
 
 logger = setup_logger(__name__)
 
@@ -26,7 +27,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "error": "Invalid request data",
             "error_type": "ValidationError",
             "details": exc.errors(),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
     )
 
@@ -50,7 +51,7 @@ async def general_exception_handler(request: Request, exc: Exception):
             "success": False,
             "error": "Internal server error",
             "error_type": type(exc).__name__,
-            "timestamp": datetime.utcnow().isoformat(),
-            "message": str(exc) if logger.level == 10 else "An error occurred"  # Show details only in DEBUG
+            "timestamp": iso_now(),
+            "message": str(exc) if logger.isEnabledFor(logging.DEBUG) else "An error occurred"  # Show details only in DEBUG
         }
     )
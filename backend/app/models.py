@@ -2,41 +2,34 @@
 Pydantic Models for Request/Response Validation
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, List, Optional, Dict
 from datetime import datetime
 
 
 class NewsDetectionRequest(BaseModel):
     """
     Request model for fake news detection
+    Whitespace stripping and length checks run in pydantic-core
     """
-    title: str = Field(
-        ..., 
-        min_length=5, 
-        max_length=500,
+    title: Annotated[str, StringConstraints(strip_whitespace=True, min_length=5, max_length=500)] = Field(
+        ...,
         description="News article title",
-        example="BREAKING: Scientists Discover Miracle Cure"
+        examples=["BREAKING: Scientists Discover Miracle Cure"]
     )
-    text: str = Field(
-        ..., 
-        min_length=20, 
-        max_length=10000,
+    text: Annotated[str, StringConstraints(strip_whitespace=True, min_length=20, max_length=10000)] = Field(
+        ...,
         description="News article content",
-        example="Amazing breakthrough that doctors don't want you to know..."
+        examples=["Amazing breakthrough that doctors don't want you to know..."]
     )
-    
-    @validator('title', 'text')
-    def validate_not_empty(cls, v):
-        if not v.strip():
-            raise ValueError("Field cannot be empty or whitespace only")
-        return v.strip()
 
 
 class WordHighlight(BaseModel):
     """
     Word importance from SHAP analysis
     """
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     word: str
     importance: float
     direction: str  # "fake" or "real"
@@ -64,14 +57,13 @@ class HealthResponse(BaseModel):
     """
     Health check response
     """
+    model_config = ConfigDict(protected_namespaces=())
+    
     status: str
     app_name: str
     version: str
     is_model_loaded: bool  # ← Changed from model_loaded
     timestamp: str
-    
-    class Config:
-        protected_namespaces = ()  # ← Add this
 
 
 
@@ -3,22 +3,27 @@ Detection API Routes
 Main endpoints for fake news detection
 """
 
-from fastapi import APIRouter, HTTPException, status
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import asyncio
 import uuid
 import time
+import orjson
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from app.models import (
     NewsDetectionRequest,
     DetectionResponse,
-    WordHighlight,
     ErrorResponse
 )
 from app.services.model_service import ModelService
 from app.services.xai_service import XAIService
 from app.services.llm_service import LLMService
+from app.services.cache_service import DetectionCache, SingleFlight
+from app.config import SETTINGS as settings
 from app.utils.aws_utils import DynamoDBService
 from app.utils.logger import setup_logger
+from app.utils.timestamps import iso_now
 
 logger = setup_logger(__name__)
 router = APIRouter(prefix="/api", tags=["Detection"])
@@ -28,16 +33,237 @@ model_service = ModelService()
 xai_service = XAIService(model_service)
 llm_service = LLMService()
 dynamodb_service = DynamoDBService()
+detection_cache = DetectionCache()
+single_flight = SingleFlight(max_keys=settings.SINGLE_FLIGHT_MAX_KEYS)
+
+
+def _cache_opt_out(http_request: Request) -> bool:
+    """
+    Check if the client asked to bypass the result cache
+    """
+    cache_control = http_request.headers.get("cache-control", "").lower()
+    return "no-cache" in cache_control or "no-store" in cache_control
+
+
+def _refresh_payload(payload: Dict, request_id: str, start_time_ns: int) -> Dict:
+    """
+    Copy a shared (cached or coalesced) payload with this request's metadata
+    """
+    return {
+        **payload,
+        "processing_time_ms": (time.perf_counter_ns() - start_time_ns) / 1e6,
+        "timestamp": iso_now(),
+        "request_id": request_id
+    }
+
+
+async def _log_shared_payload(request: NewsDetectionRequest, payload: Dict):
+    """
+    Queue a DynamoDB record for a request served from a cached or coalesced
+    payload, so every returned request_id has its own record
+    """
+    await dynamodb_service.log_prediction_async(
+        request_id=payload['request_id'],
+        title=request.title,
+        text=request.text,
+        prediction=payload['prediction'],
+        confidence=payload['confidence'],
+        word_highlights=payload['word_highlights'],
+        explanation=payload['explanation'],
+        processing_time_ms=payload['processing_time_ms']
+    )
+
+
+def _public_word_highlights(word_importance: List[Dict]) -> List[Dict]:
+    """
+    Keep only the public DetectionResponse fields (shap_value stays internal,
+    there is no response_model filtering)
+    """
+    return [
+        {
+            "word": w['word'],
+            "importance": w['importance'],
+            "direction": w['direction']
+        }
+        for w in word_importance
+    ]
+
+
+def _sse_event(event: str, data: Dict) -> bytes:
+    """
+    Encode one Server-Sent Event with a JSON data line
+    """
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _single_delta(text: str) -> AsyncIterator[str]:
+    """
+    Wrap a complete explanation as a one-chunk stream
+    """
+    yield text
+
+
+def _is_confident(prediction_result: Dict) -> bool:
+    """
+    Confidence gate: above XAI_THRESHOLD the canned explanation is good
+    enough, so full attribution and Gemini are skipped
+    """
+    return prediction_result['confidence'] > settings.XAI_THRESHOLD
+
+
+async def _analyze(request: NewsDetectionRequest, request_id: str) -> Tuple[Dict, List[Dict]]:
+    """
+    Run model prediction and XAI word importance
+    
+    Returns:
+        (prediction_result, word_importance)
+    """
+    # Step 1: Model Prediction
+    if settings.DEBUG:
+        logger.info(f"[{request_id}] Step 1: Running RoBERTa prediction...")
+    prediction_result = await model_service.predict(request.title, request.text)
+    
+    # Step 2: XAI Analysis
+    # Attribution is CPU/GPU bound - run it off the event loop
+    if _is_confident(prediction_result):
+        if settings.DEBUG:
+            logger.info(f"[{request_id}] Step 2: High confidence, using attention highlights...")
+        xai_fn = xai_service.get_attention_importance
+        xai_kwargs = {}
+    else:
+        if settings.DEBUG:
+            logger.info(f"[{request_id}] Step 2: Running XAI analysis...")
+        xai_fn = xai_service.get_word_importance
+        # SHAP reuses the main prediction as its unmasked evaluation
+        xai_kwargs = {
+            "probabilities": [prediction_result['fake_probability'], prediction_result['real_probability']]
+        }
+    word_importance = await asyncio.to_thread(
+        xai_fn,
+        combined_text=prediction_result['combined_text'],
+        predicted_class=prediction_result['predicted_class'],
+        top_n=15,
+        words=prediction_result['words'],
+        **xai_kwargs
+    )
+    
+    return prediction_result, word_importance
+
+
+async def _finalize(
+    request: NewsDetectionRequest,
+    request_id: str,
+    start_time_ns: int,
+    prediction_result: Dict,
+    word_importance: List[Dict],
+    explanation: str,
+    cache_key: Optional[bytes] = None,
+    explanation_complete: bool = True
+) -> Dict:
+    """
+    Log to DynamoDB, build the response payload and store it in the
+    result cache when cache_key is given (and the explanation is complete)
+    """
+    # Calculate total processing time
+    total_time_ms = (time.perf_counter_ns() - start_time_ns) / 1e6
+    
+    # Step 4: Queue for DynamoDB (batched in the background, don't block response)
+    if settings.DEBUG:
+        logger.info(f"[{request_id}] Step 4: Logging to DynamoDB...")
+    await dynamodb_service.log_prediction_async(
+        request_id=request_id,
+        title=request.title,
+        text=request.text,
+        prediction=prediction_result['prediction'],
+        confidence=prediction_result['confidence'],
+        word_highlights=word_importance,
+        explanation=explanation,
+        processing_time_ms=total_time_ms
+    )
+    
+    # Build response (plain dict, serialized directly by orjson)
+    payload = {
+        "success": True,
+        "prediction": prediction_result['prediction'],
+        "confidence": prediction_result['confidence'],
+        "fake_probability": prediction_result['fake_probability'],
+        "real_probability": prediction_result['real_probability'],
+        "explanation": explanation,
+        "word_highlights": _public_word_highlights(word_importance),
+        "processing_time_ms": total_time_ms,
+        "timestamp": iso_now(),
+        "request_id": request_id
+    }
+    
+    # Single structured log line per request
+    logger.info(
+        f"[{request_id}] Detection completed: {payload['prediction']} "
+        f"({payload['confidence']:.2%}) in {total_time_ms:.0f}ms",
+        extra={
+            "request_id": request_id,
+            "prediction": payload['prediction'],
+            "confidence": payload['confidence'],
+            "processing_time_ms": total_time_ms
+        }
+    )
+    
+    if cache_key is not None and explanation_complete:
+        # Gated results use the canned explanation by design - cache normally
+        is_fallback = not _is_confident(prediction_result) and explanation == llm_service._get_fallback_explanation(
+            prediction_result['prediction'],
+            prediction_result['confidence']
+        )
+        await detection_cache.set(cache_key, payload, is_fallback=is_fallback)
+    
+    return payload
+
+
+async def _run_detection(
+    request: NewsDetectionRequest,
+    request_id: str,
+    start_time_ns: int,
+    cache_key: Optional[bytes] = None
+) -> Dict:
+    """
+    Run the full detection pipeline and build the response payload
+    Stores the payload in the result cache when cache_key is given
+    """
+    prediction_result, word_importance = await _analyze(request, request_id)
+    
+    # Step 3: Generate LLM Explanation
+    if _is_confident(prediction_result):
+        explanation = llm_service._get_fallback_explanation(
+            prediction_result['prediction'],
+            prediction_result['confidence']
+        )
+    else:
+        if settings.DEBUG:
+            logger.info(f"[{request_id}] Step 3: Generating Gemini explanation...")
+        # Gemini needs the SHAP words for its prompt, so it follows Step 2;
+        # the async client keeps the event loop free while it waits
+        explanation = await llm_service.generate_explanation(
+            title=request.title,
+            text=request.text,
+            prediction=prediction_result['prediction'],
+            confidence=prediction_result['confidence'],
+            word_highlights=word_importance
+        )
+    
+    return await _finalize(
+        request, request_id, start_time_ns,
+        prediction_result, word_importance, explanation,
+        cache_key=cache_key
+    )
 
 
 @router.post(
     "/detect",
-    response_model=DetectionResponse,
+    responses={200: {"model": DetectionResponse}},
     status_code=status.HTTP_200_OK,
     summary="Detect fake news from title and text",
     description="Analyzes news article and returns prediction with XAI explanation"
 )
-async def detect_fake_news(request: NewsDetectionRequest):
+async def detect_fake_news(request: NewsDetectionRequest, http_request: Request):
     """
     Main endpoint for fake news detection
     
@@ -52,93 +278,53 @@ async def detect_fake_news(request: NewsDetectionRequest):
     - word_highlights: Top words influencing prediction
     - processing_time_ms: Total processing time
     
+    Repeated articles are served from an in-memory cache; send
+    `Cache-Control: no-cache` to force a fresh analysis.
+    
     **Process Flow:**
     1. Validate and preprocess input
     2. RoBERTa model prediction
-    3. SHAP XAI analysis (word importance)
+    3. XAI analysis (word importance)
     4. Gemini LLM explanation generation
     5. Log to DynamoDB
     6. Return results
+    
+    Predictions above XAI_THRESHOLD confidence skip steps 3-4: word
+    highlights come from attention weights and the explanation is canned.
     """
     request_id = str(uuid.uuid4())
-    start_time = time.time()
+    start_time_ns = time.perf_counter_ns()
     
     try:
-        logger.info(f"[{request_id}] Detection request received")
-        logger.info(f"[{request_id}] Title: {request.title[:50]}...")
+        if settings.DEBUG:
+            logger.info(f"[{request_id}] Detection request received")
+            logger.info(f"[{request_id}] Title: {request.title[:50]}...")
         
-        # Step 1: Model Prediction
-        logger.info(f"[{request_id}] Step 1: Running RoBERTa prediction...")
-        prediction_result = model_service.predict(request.title, request.text)
+        # Step 0: Result cache lookup
+        cache_key = DetectionCache.make_key(request.title, request.text)
+        use_cache = settings.CACHE_ENABLED and not _cache_opt_out(http_request)
+        if use_cache:
+            cached_payload = await detection_cache.get(cache_key)
+            if cached_payload is not None:
+                payload = _refresh_payload(cached_payload, request_id, start_time_ns)
+                await _log_shared_payload(request, payload)
+                logger.info(f"[{request_id}] Cache hit: {payload['prediction']} in {payload['processing_time_ms']:.2f}ms")
+                return ORJSONResponse(payload)
         
-        # Step 2: XAI Analysis
-        logger.info(f"[{request_id}] Step 2: Running SHAP XAI analysis...")
-        word_importance = xai_service.get_word_importance(
-            combined_text=prediction_result['combined_text'],
-            predicted_class=prediction_result['predicted_class'],
-            top_n=15
-        )
-        
-        # Convert to response format
-        word_highlights = [
-            WordHighlight(
-                word=w['word'],
-                importance=w['importance'],
-                direction=w['direction']
+        # Identical in-flight requests share one pipeline run
+        payload, shared = await single_flight.do(
+            cache_key,
+            lambda: _run_detection(
+                request, request_id, start_time_ns,
+                cache_key=cache_key if use_cache else None
             )
-            for w in word_importance
-        ]
-        
-        # Step 3: Generate LLM Explanation
-        logger.info(f"[{request_id}] Step 3: Generating Gemini explanation...")
-        explanation = llm_service.generate_explanation(
-            title=request.title,
-            text=request.text,
-            prediction=prediction_result['prediction'],
-            confidence=prediction_result['confidence'],
-            word_highlights=word_importance
         )
+        if shared:
+            payload = _refresh_payload(payload, request_id, start_time_ns)
+            await _log_shared_payload(request, payload)
+            logger.info(f"[{request_id}] Coalesced with in-flight request: {payload['prediction']}")
         
-        # Calculate total processing time
-        total_time_ms = (time.time() - start_time) * 1000
-        
-        # Step 4: Log to DynamoDB (async, don't block response)
-        logger.info(f"[{request_id}] Step 4: Logging to DynamoDB...")
-        try:
-            dynamodb_service.log_prediction(
-                request_id=request_id,
-                title=request.title,
-                text=request.text,
-                prediction=prediction_result['prediction'],
-                confidence=prediction_result['confidence'],
-                word_highlights=word_importance,
-                explanation=explanation,
-                processing_time_ms=total_time_ms
-            )
-        except Exception as db_error:
-            logger.error(f"[{request_id}] DynamoDB logging failed: {str(db_error)}")
-            # Don't fail the request if logging fails
-        
-        # Build response
-        response = DetectionResponse(
-            success=True,
-            prediction=prediction_result['prediction'],
-            confidence=prediction_result['confidence'],
-            fake_probability=prediction_result['fake_probability'],
-            real_probability=prediction_result['real_probability'],
-            explanation=explanation,
-            word_highlights=word_highlights,
-            processing_time_ms=total_time_ms,
-            timestamp=datetime.utcnow().isoformat(),
-            request_id=request_id
-        )
-        
-        logger.info(
-            f"[{request_id}] Detection completed: {response.prediction} "
-            f"({response.confidence:.2%}) in {total_time_ms:.0f}ms"
-        )
-        
-        return response
+        return ORJSONResponse(payload)
         
     except Exception as e:
         logger.error(f"[{request_id}] Detection failed: {str(e)}", exc_info=True)
@@ -150,11 +336,121 @@ async def detect_fake_news(request: NewsDetectionRequest):
                 "error_type": type(e).__name__,
                 "message": str(e),
                 "request_id": request_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": iso_now()
             }
         )
 
 
+@router.post(
+    "/detect/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Detect fake news and stream the explanation",
+    description="Same analysis as /detect, delivered as Server-Sent Events"
+)
+async def detect_fake_news_stream(request: NewsDetectionRequest, http_request: Request):
+    """
+    Streaming variant of /detect
+    
+    **Events (text/event-stream):**
+    - `prediction`: prediction, probabilities and word_highlights
+    - `explanation_delta`: `{"text": ...}` chunks of the Gemini explanation
+    - `done`: full explanation, processing_time_ms, timestamp, request_id
+    - `error`: sent instead of the remaining events if processing fails
+    """
+    request_id = str(uuid.uuid4())
+    start_time_ns = time.perf_counter_ns()
+    
+    cache_key = DetectionCache.make_key(request.title, request.text)
+    use_cache = settings.CACHE_ENABLED and not _cache_opt_out(http_request)
+    
+    async def event_stream():
+        try:
+            # Cached result: replay it as a single explanation chunk
+            cached_payload = await detection_cache.get(cache_key) if use_cache else None
+            if cached_payload is not None:
+                payload = _refresh_payload(cached_payload, request_id, start_time_ns)
+                await _log_shared_payload(request, payload)
+                logger.info(f"[{request_id}] Cache hit (stream): {payload['prediction']}")
+                yield _sse_event("prediction", {
+                    k: v for k, v in payload.items()
+                    if k not in ("explanation", "processing_time_ms")
+                })
+                yield _sse_event("explanation_delta", {"text": payload['explanation']})
+                yield _sse_event("done", {
+                    "explanation": payload['explanation'],
+                    "processing_time_ms": payload['processing_time_ms'],
+                    "timestamp": payload['timestamp'],
+                    "request_id": request_id
+                })
+                return
+            
+            prediction_result, word_importance = await _analyze(request, request_id)
+            
+            yield _sse_event("prediction", {
+                "success": True,
+                "prediction": prediction_result['prediction'],
+                "confidence": prediction_result['confidence'],
+                "fake_probability": prediction_result['fake_probability'],
+                "real_probability": prediction_result['real_probability'],
+                "word_highlights": _public_word_highlights(word_importance),
+                "timestamp": iso_now(),
+                "request_id": request_id
+            })
+            
+            # Step 3: Stream LLM Explanation (canned text past the confidence gate)
+            explanation_parts = []
+            stream_status = {}
+            if _is_confident(prediction_result):
+                deltas = _single_delta(llm_service._get_fallback_explanation(
+                    prediction_result['prediction'],
+                    prediction_result['confidence']
+                ))
+            else:
+                deltas = llm_service.stream_explanation(
+                    title=request.title,
+                    text=request.text,
+                    prediction=prediction_result['prediction'],
+                    confidence=prediction_result['confidence'],
+                    word_highlights=word_importance,
+                    status=stream_status
+                )
+            async for delta in deltas:
+                explanation_parts.append(delta)
+                yield _sse_event("explanation_delta", {"text": delta})
+            
+            # A stream cut off by a Gemini error is sent as is but never cached
+            payload = await _finalize(
+                request, request_id, start_time_ns,
+                prediction_result, word_importance, "".join(explanation_parts).strip(),
+                cache_key=cache_key if use_cache else None,
+                explanation_complete=not stream_status.get("failed", False)
+            )
+            
+            yield _sse_event("done", {
+                "explanation": payload['explanation'],
+                "processing_time_ms": payload['processing_time_ms'],
+                "timestamp": payload['timestamp'],
+                "request_id": request_id
+            })
+            
+        except Exception as e:
+            logger.error(f"[{request_id}] Streaming detection failed: {str(e)}", exc_info=True)
+            yield _sse_event("error", {
+                "success": False,
+                "error": "Detection processing failed",
+                "error_type": type(e).__name__,
+                "message": str(e),
+                "request_id": request_id,
+                "timestamp": iso_now()
+            })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/health",
     summary="Health check endpoint",
@@ -167,21 +463,21 @@ async def health_check():
     try:
         is_healthy = model_service.is_loaded()
         
-        return {
+        return ORJSONResponse({
             "status": "healthy" if is_healthy else "unhealthy",
             "app_name": "TruthLens Fake News Detection API",
             "version": "1.0.0",
             "is_model_loaded": is_healthy,  # ← Changed from model_loaded
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": iso_now()
+        })
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
-        return {
+        return ORJSONResponse({
             "status": "unhealthy",
             "app_name": "TruthLens Fake News Detection API",
             "version": "1.0.0",
             "is_model_loaded": False,  # ← Changed from model_loaded
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": iso_now()
+        })
 
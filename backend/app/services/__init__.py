@@ -5,5 +5,6 @@ Services package initialization
 from app.services.model_service import ModelService
 from app.services.xai_service import XAIService
 from app.services.llm_service import LLMService
+from app.services.cache_service import DetectionCache, SingleFlight
 
-__all__ = ['ModelService', 'XAIService', 'LLMService']
+__all__ = ['ModelService', 'XAIService', 'LLMService', 'DetectionCache', 'SingleFlight']
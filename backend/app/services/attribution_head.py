@@ -0,0 +1,157 @@
+"""
+Distilled Attribution Head
+Linear head over RoBERTa's last hidden states, trained offline to reproduce
+SHAP token values - serves SHAP-like attributions in a single forward pass
+"""
+
+import torch
+from typing import Iterable, List, Tuple
+import argparse
+import asyncio
+import time
+
+from app.config import SETTINGS as settings
+from app.utils.logger import setup_logger
+from app.utils.preprocessing import TextPreprocessor
+
+logger = setup_logger(__name__)
+
+
+class AttributionHead(torch.nn.Module):
+    """
+    Per-token SHAP value estimate for both classes [tokens, 2]
+    """
+
+    def __init__(self, hidden_size: int):
+        super().__init__()
+        self.proj = torch.nn.Linear(hidden_size, 2)
+
+    def forward(self, hidden_states: torch.Tensor) -> torch.Tensor:
+        return self.proj(hidden_states)
+
+
+def load_attribution_head(path: str, hidden_size: int, device) -> AttributionHead:
+    """
+    Load trained head weights (state dict saved by train_attribution_head)
+
+    Args:
+        path: Path to the .pt file
+        hidden_size: Encoder hidden size
+        device: Target device
+
+    Returns:
+        AttributionHead in eval mode
+    """
+    head = AttributionHead(hidden_size)
+    head.load_state_dict(torch.load(path, map_location="cpu"))
+    return head.to(device).eval()
+
+
+def _collect_examples(
+    xai_service,
+    articles: Iterable[Tuple[str, str]],
+    max_words: int
+) -> List[Tuple[torch.Tensor, torch.Tensor]]:
+    """
+    Run SHAP on each article and pair its token values with the
+    encoder's last hidden states
+    """
+    model = xai_service.model_service.eager_model
+    tokenizer = xai_service.tokenizer
+    examples = []
+
+    for title, text in articles:
+        # Same input the head scores at serve time: cleaned "title </s> text"
+        # (as ModelService.predict builds it), cut to the first max_words words
+        combined_text = TextPreprocessor.combine_title_text(title, text, max_words=settings.MAX_TEXT_LENGTH)
+        text = " ".join(TextPreprocessor.tokenize_words(combined_text)[:max_words])
+        if not text:
+            continue
+
+        # SHAP keeps <s>/</s> as (zero-valued) features, so its values line
+        # up with the tokenizer's input_ids
+        targets = torch.tensor(xai_service.explain_tokens(text).values[0], dtype=torch.float32)
+        inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=settings.MAX_TEXT_LENGTH)
+        if inputs["input_ids"].shape[1] != targets.shape[0]:
+            logger.warning(f"Skipping example: {inputs['input_ids'].shape[1]} tokens vs {targets.shape[0]} SHAP values")
+            continue
+
+        inputs = {k: v.to(xai_service.device) for k, v in inputs.items()}
+        # no_grad (not inference_mode) - the hidden states are reused for training
+        with torch.no_grad():
+            hidden = model(**inputs, output_hidden_states=True).hidden_states[-1][0].float()
+        examples.append((hidden, targets.to(hidden.device)))
+
+    return examples
+
+
+def train_attribution_head(
+    xai_service,
+    articles: Iterable[Tuple[str, str]],
+    epochs: int = 20,
+    lr: float = 1e-3,
+    max_words: int = 30
+) -> AttributionHead:
+    """
+    Distill SHAP into an AttributionHead (offline)
+    Targets are SHAP values from the current Permutation explainer,
+    fitted with MSE on every token
+
+    Args:
+        xai_service: XAIService with a loaded model
+        articles: Training articles as (title, text) pairs
+        epochs: Passes over the examples
+        lr: Adam learning rate
+        max_words: Words per article explained (matches serving window)
+
+    Returns:
+        Trained AttributionHead (on CPU)
+    """
+    start_time = time.time()
+    examples = _collect_examples(xai_service, articles, max_words)
+    if not examples:
+        raise ValueError("No usable training examples")
+    logger.info(f"Collected SHAP targets for {len(examples)} articles in {time.time() - start_time:.0f}s")
+
+    hidden_size = examples[0][0].shape[-1]
+    head = AttributionHead(hidden_size).to(examples[0][0].device)
+    optimizer = torch.optim.Adam(head.parameters(), lr=lr)
+
+    for epoch in range(epochs):
+        total_loss = 0.0
+        for hidden, targets in examples:
+            optimizer.zero_grad()
+            loss = torch.nn.functional.mse_loss(head(hidden), targets)
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item()
+        logger.info(f"Epoch {epoch + 1}/{epochs}: mse={total_loss / len(examples):.6f}")
+
+    return head.cpu().eval()
+
+
+if __name__ == "__main__":
+    # python -m app.services.attribution_head articles.tsv attribution_head.pt
+    from app.services.model_service import ModelService
+    from app.services.xai_service import XAIService
+
+    parser = argparse.ArgumentParser(description="Distill SHAP into an attribution head")
+    parser.add_argument("articles", help="Text file, one article per line as title<TAB>text")
+    parser.add_argument("output", nargs="?", default=settings.XAI_HEAD_PATH)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    model_service = ModelService()
+    asyncio.run(model_service.ensure_loaded())
+
+    with open(args.articles, encoding="utf-8") as f:
+        articles = [
+            tuple(line.rstrip("\n").split("\t", 1))
+            for line in f
+            if "\t" in line
+        ]
+
+    head = train_attribution_head(XAIService(model_service), articles, epochs=args.epochs, lr=args.lr)
+    torch.save(head.state_dict(), args.output)
+    logger.info(f"Attribution head saved to {args.output}")
@@ -0,0 +1,131 @@
+"""
+In-Memory Cache for Detection Results
+Skips the full RoBERTa + SHAP + Gemini pipeline for repeated articles
+"""
+
+from cachetools import LRUCache, TTLCache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+
+from app.config import SETTINGS as settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class DetectionCache:
+    """
+    LRU cache of detection payloads keyed by a hash of (title, text)
+    
+    Results built on a fallback explanation (Gemini failed) are kept in a
+    separate short-TTL cache so the LLM is retried soon after
+    """
+    
+    def __init__(self):
+        """
+        Initialize result and fallback caches
+        """
+        self._results = LRUCache(maxsize=settings.CACHE_MAX_SIZE)
+        self._fallback_results = TTLCache(
+            maxsize=settings.CACHE_MAX_SIZE,
+            ttl=settings.CACHE_FALLBACK_TTL_SECONDS
+        )
+        self._lock = asyncio.Lock()
+        logger.info(f"Detection cache initialized (max size: {settings.CACHE_MAX_SIZE})")
+    
+    @staticmethod
+    def make_key(title: str, text: str) -> bytes:
+        """
+        Build cache key from normalized title and text
+        """
+        return hashlib.blake2b(f"{title}\0{text}".encode(), digest_size=16).digest()
+    
+    async def get(self, key: bytes) -> Optional[Dict]:
+        """
+        Return cached payload or None
+        """
+        async with self._lock:
+            payload = self._results.get(key)
+            if payload is None:
+                payload = self._fallback_results.get(key)
+        return payload
+    
+    async def set(self, key: bytes, payload: Dict, is_fallback: bool = False):
+        """
+        Store payload
+        
+        Args:
+            key: Cache key from make_key
+            payload: Detection response payload
+            is_fallback: True if the explanation is the fallback text
+        """
+        async with self._lock:
+            if is_fallback:
+                self._fallback_results[key] = payload
+            else:
+                self._results[key] = payload
+                self._fallback_results.pop(key, None)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution
+    
+    The first caller (leader) runs the work; callers arriving while it is in
+    flight await the leader's future instead of recomputing. If the leader
+    is cancelled, a waiting caller becomes the new leader
+    """
+    
+    def __init__(self, max_keys: int):
+        """
+        Args:
+            max_keys: Cap on tracked in-flight keys (extra calls run uncoalesced)
+        """
+        self._futures: Dict[bytes, asyncio.Future] = {}
+        self._max_keys = max_keys
+    
+    async def do(self, key: bytes, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn once per in-flight key
+        
+        Args:
+            key: Deduplication key
+            fn: Zero-argument coroutine function producing the result
+            
+        Returns:
+            (result, shared) - shared is True if another call produced the result
+        """
+        # No await between lookup and insert, so this is atomic on the event loop
+        future = self._futures.get(key)
+        while future is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # shield keeps our own cancellation off the future, so a
+                # cancelled future means the leader was cancelled (e.g. its
+                # client disconnected) - take over instead of failing
+                if not future.cancelled():
+                    raise
+            future = self._futures.get(key)
+        
+        if len(self._futures) >= self._max_keys:
+            logger.warning("Single-flight map full, running request uncoalesced")
+            return await fn(), False
+        
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved in case nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._futures.pop(key, None)
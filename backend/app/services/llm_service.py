@@ -3,16 +3,54 @@ Gemini LLM Service for Generating Human-Readable Explanations
 """
 
 import google.generativeai as genai
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional
+import operator
 import time
 
-from app.config import get_settings
+from app.config import SETTINGS as settings
 from app.utils.logger import setup_logger
 from app.utils.preprocessing import TextPreprocessor
 
-settings = get_settings()
 logger = setup_logger(__name__)
 
+_get_word = operator.itemgetter('word')
+
+# Static instruction block - identical for every request, so it is sent
+# once as system instruction rather than with each article
+_SYSTEM_INSTRUCTION = """You are an expert fact-checker explaining fake news detection results.
+
+Each request gives you an article, its detection result and the key linguistic indicators found by an automated analysis.
+
+**Task:**
+Generate a clear, 2-3 sentence explanation for a general audience explaining:
+1. Why this article appears to be fake or real, as stated in the detection result
+2. What specific language patterns or red flags were detected
+3. One practical tip for readers to identify such content
+
+**Guidelines:**
+- Use simple, conversational language
+- Be educational, not accusatory
+- Avoid technical jargon (no "SHAP", "model", "AI")
+- Focus on actionable insights
+- Keep it concise (under 150 words)"""
+
+# Per-article part of the prompt
+_PROMPT_TEMPLATE = """**Article Analysis:**
+Title: "{title}"
+Text Preview: "{text_preview}"
+
+**Detection Result:**
+Prediction: {prediction}
+Confidence: {confidence_pct:.1f}%
+
+**Key Linguistic Indicators (from AI analysis):**
+- Words indicating FAKE news: {fake_words_str}
+- Words indicating REAL news: {real_words_str}
+
+Explain why this article appears to be {prediction_lower}.
+
+**Explanation:**"""
+
 
 class LLMService:
     """
@@ -25,13 +63,19 @@ class LLMService:
         """
         try:
             genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
+            # Static instruction block sent as system instruction; each
+            # request's prompt carries only the per-article fields
+            self.model = genai.GenerativeModel(settings.GEMINI_MODEL, system_instruction=_SYSTEM_INSTRUCTION)
+            self._generation_config = genai.types.GenerationConfig(
+                temperature=settings.GEMINI_TEMPERATURE,
+                max_output_tokens=settings.GEMINI_MAX_TOKENS,
+            )
             logger.info(f"Gemini LLM initialized: {settings.GEMINI_MODEL}")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini: {str(e)}", exc_info=True)
             raise RuntimeError(f"Gemini initialization failed: {str(e)}")
     
-    def generate_explanation(
+    async def generate_explanation(
         self,
         title: str,
         text: str,
@@ -55,54 +99,115 @@ class LLMService:
         try:
             start_time = time.time()
             
-            # Prepare word lists
-            fake_words = [
-                w for w in word_highlights 
-                if w['direction'] == 'fake'
-            ][:5]
-            
-            real_words = [
-                w for w in word_highlights 
-                if w['direction'] == 'real'
-            ][:5]
-            
-            # Truncate text for LLM
-            text_preview = TextPreprocessor.truncate_text_for_llm(text, max_words=100)
-            
-            # Build structured prompt
-            prompt = self._build_prompt(
-                title=title,
-                text_preview=text_preview,
-                prediction=prediction,
-                confidence=confidence,
-                fake_words=fake_words,
-                real_words=real_words
-            )
+            prompt = self._prepare_prompt(title, text, prediction, confidence, word_highlights)
             
             # Generate explanation
-            logger.debug(f"Calling Gemini API with prompt length: {len(prompt)}")
+            logger.debug("Calling Gemini API with prompt length: %d", len(prompt))
             
-            response = self.model.generate_content(
+            response = await self.model.generate_content_async(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=settings.GEMINI_TEMPERATURE,
-                    max_output_tokens=settings.GEMINI_MAX_TOKENS,
-                )
+                generation_config=self._generation_config
             )
             
             explanation = response.text.strip()
             
             llm_time = (time.time() - start_time) * 1000
-            logger.info(f"Gemini explanation generated in {llm_time:.0f}ms")
-            logger.debug(f"Explanation length: {len(explanation)} chars")
+            logger.debug("Gemini explanation generated in %.0fms", llm_time)
+            logger.debug("Explanation length: %d chars", len(explanation))
             
             return explanation
             
         except Exception as e:
             logger.error(f"Gemini API failed: {str(e)}", exc_info=True)
+            logger.warning("Using fallback explanation (Gemini API failed)")
             # Return fallback explanation
             return self._get_fallback_explanation(prediction, confidence)
     
+    async def stream_explanation(
+        self,
+        title: str,
+        text: str,
+        prediction: str,
+        confidence: float,
+        word_highlights: List[Dict],
+        status: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the explanation from Gemini as text deltas
+        
+        Args:
+            Same as generate_explanation, plus
+            status: Optional dict; status["failed"] is set to True if
+                Gemini fails after some text was streamed (the explanation
+                is then truncated)
+            
+        Yields:
+            Explanation text chunks as they arrive (the fallback explanation
+            as a single chunk if Gemini fails before producing any text)
+        """
+        streamed_any = False
+        try:
+            start_time = time.time()
+            
+            prompt = self._prepare_prompt(title, text, prediction, confidence, word_highlights)
+            
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config,
+                stream=True
+            )
+            
+            async for chunk in response:
+                if chunk.text:
+                    streamed_any = True
+                    yield chunk.text
+            
+            llm_time = (time.time() - start_time) * 1000
+            logger.debug("Gemini explanation streamed in %.0fms", llm_time)
+            
+        except Exception as e:
+            logger.error(f"Gemini streaming failed: {str(e)}", exc_info=True)
+            if not streamed_any:
+                logger.warning("Using fallback explanation (Gemini API failed)")
+                yield self._get_fallback_explanation(prediction, confidence)
+            elif status is not None:
+                status["failed"] = True
+    
+    def _prepare_prompt(
+        self,
+        title: str,
+        text: str,
+        prediction: str,
+        confidence: float,
+        word_highlights: List[Dict]
+    ) -> str:
+        """
+        Select top indicator words, truncate text and build the prompt
+        """
+        # Prepare word lists
+        fake_words = [
+            w for w in word_highlights 
+            if w['direction'] == 'fake'
+        ][:5]
+        
+        real_words = [
+            w for w in word_highlights 
+            if w['direction'] == 'real'
+        ][:5]
+        
+        # Truncate text for LLM
+        text_preview = TextPreprocessor.truncate_text_for_llm(text, max_words=100)
+        
+        # Build structured prompt
+        return self._build_prompt(
+            title=title,
+            text_preview=text_preview,
+            prediction=prediction,
+            confidence=confidence,
+            fake_words=fake_words,
+            real_words=real_words
+        )
+    
     def _build_prompt(
         self,
         title: str,
@@ -116,46 +221,23 @@ class LLMService:
         Build structured prompt for Gemini
         """
         # Format word lists
-        fake_words_str = ", ".join([f"'{w['word']}'" for w in fake_words]) if fake_words else "none"
-        real_words_str = ", ".join([f"'{w['word']}'" for w in real_words]) if real_words else "none"
-        
-        prompt = f"""You are an expert fact-checker explaining fake news detection results.
-
-**Article Analysis:**
-Title: "{title}"
-Text Preview: "{text_preview}"
-
-**Detection Result:**
-Prediction: {prediction}
-Confidence: {confidence*100:.1f}%
-
-**Key Linguistic Indicators (from AI analysis):**
-- Words indicating FAKE news: {fake_words_str}
-- Words indicating REAL news: {real_words_str}
-
-**Task:**
-Generate a clear, 2-3 sentence explanation for a general audience explaining:
-1. Why this article appears to be {prediction.lower()}
-2. What specific language patterns or red flags were detected
-3. One practical tip for readers to identify such content
-
-**Guidelines:**
-- Use simple, conversational language
-- Be educational, not accusatory
-- Avoid technical jargon (no "SHAP", "model", "AI")
-- Focus on actionable insights
-- Keep it concise (under 150 words)
-
-**Explanation:**"""
+        fake_words_str = ", ".join(f"'{word}'" for word in map(_get_word, fake_words)) or "none"
+        real_words_str = ", ".join(f"'{word}'" for word in map(_get_word, real_words)) or "none"
         
-        return prompt
+        return _PROMPT_TEMPLATE.format(
+            title=title,
+            text_preview=text_preview,
+            prediction=prediction,
+            prediction_lower=prediction.lower(),
+            confidence_pct=confidence * 100,
+            fake_words_str=fake_words_str,
+            real_words_str=real_words_str
+        )
     
     def _get_fallback_explanation(self, prediction: str, confidence: float) -> str:
         """
         Fallback explanation if Gemini API fails
         """
-        logger.warning("Using fallback explanation (Gemini API failed)")
-        
         if prediction == "Fake":
             return (
                 f"This article shows signs of misinformation with {confidence*100:.1f}% confidence. "
@@ -1,24 +1,110 @@
 """
-XAI Service using SHAP for Explainability
+XAI Service for Explainability
+Integrated gradients (default), SHAP or distilled-SHAP word importance
 FIXED VERSION - Correctly extracts word importance for predicted class
 """
 
-import shap
 import numpy as np
 import torch
-from typing import List, Dict
+from cachetools import LRUCache
+from captum.attr import IntegratedGradients
+from typing import List, Dict, Optional, Tuple
+import bisect
+import copy
+import hashlib
+import logging
+import os
+import re
+import threading
 import time
+import warnings
 
-from app.config import get_settings
+from app.config import SETTINGS as settings
+from app.services.attribution_head import AttributionHead, load_attribution_head
 from app.utils.logger import setup_logger
+from app.utils.preprocessing import TextPreprocessor
 
-settings = get_settings()
 logger = setup_logger(__name__)
 
+# Words passed to SHAP (and reported from it)
+SHAP_MAX_WORDS = 30
+
+_WORD_RE = re.compile(r'\S+')
+
+# Keyword indicators for the fallback word importance
+_FAKE_INDICATORS = frozenset({
+    'shocking', 'breaking', 'revealed', 'secret', 'conspiracy',
+    'amazing', 'unbelievable', 'miracle', 'doctors hate', 'they',
+    'delete', 'share', 'before', 'anonymous', 'sources'
+})
+
+_REAL_INDICATORS = frozenset({
+    'according', 'reuters', 'reported', 'official', 'announced',
+    'study', 'research', 'data', 'government', 'experts'
+})
+
+
+def _proba_key(text: str) -> bytes:
+    """
+    Cache key for a text's probability row
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _import_shap():
+    """
+    Import shap on first use - it pulls in numba, scipy and sklearn, which
+    the default integrated-gradients path never needs
+    JIT-compiled numba helpers are cached on disk across restarts
+    """
+    os.environ.setdefault("NUMBA_CACHE_DIR", settings.NUMBA_CACHE_DIR)
+    try:
+        from numba.core.errors import NumbaDeprecationWarning, NumbaPendingDeprecationWarning
+        warnings.simplefilter("ignore", category=NumbaDeprecationWarning)
+        warnings.simplefilter("ignore", category=NumbaPendingDeprecationWarning)
+    except ImportError:
+        pass
+    
+    import shap
+    return shap
+
+
+def _aggregate_to_words(
+    text: str,
+    offsets: List[Tuple[int, int]],
+    token_scores: List[float],
+    special_mask: List[bool]
+) -> Tuple[List[str], List[float]]:
+    """
+    Sum sub-word token scores into whitespace-separated words
+    
+    Args:
+        text: Text that was tokenized
+        offsets: Character span of each token
+        token_scores: Attribution per token
+        special_mask: True for special tokens (<s>, </s>, ...)
+        
+    Returns:
+        Words and their summed scores, in text order
+    """
+    spans = [m.span() for m in _WORD_RE.finditer(text)]
+    starts = [start for start, _ in spans]
+    
+    word_scores = {}
+    for (start, end), score, is_special in zip(offsets, token_scores, special_mask):
+        if is_special or end <= start:
+            continue
+        idx = bisect.bisect_right(starts, start) - 1
+        if idx >= 0:
+            word_scores[idx] = word_scores.get(idx, 0.0) + score
+    
+    words = [text[spans[idx][0]:spans[idx][1]] for idx in word_scores]
+    return words, list(word_scores.values())
+
 
 class XAIService:
     """
-    SHAP-based explainability service
+    Word-level explainability service (integrated gradients, SHAP or distilled SHAP)
     """
     
     def __init__(self, model_service):
@@ -29,14 +115,45 @@ class XAIService:
             model_service: ModelService instance
         """
         self.model_service = model_service
-        self.model = model_service.model
-        self.tokenizer = model_service.tokenizer
-        self.device = model_service.device
-        logger.info("XAI Service initialized")
+        self._masker = None
+        self._explainer = None
+        self._explainer_lock = threading.Lock()
+        # Probability rows per masked text; only touched by the explainer,
+        # so _explainer_lock also guards it
+        self._proba_cache = LRUCache(maxsize=settings.XAI_PROBA_CACHE_SIZE)
+        self._shap_model = None
+        self._shap_model_lock = threading.Lock()
+        self._head = None
+        self._head_failed = False
+        self._ig = None
+        logger.info(f"XAI Service initialized (method: {settings.XAI_METHOD})")
+    
+    # Read through to the model service, which loads its weights lazily
+    @property
+    def model(self):
+        return self.model_service.model
+    
+    @property
+    def tokenizer(self):
+        return self.model_service.tokenizer
+    
+    @property
+    def device(self):
+        return self.model_service.device
+    
+    def _tokenize(self, text: str, **kwargs):
+        """
+        Call the shared tokenizer under the model service's tokenizer lock
+        (XAI runs in worker threads alongside batched predictions)
+        """
+        with self.model_service.tokenizer_lock:
+            return self.tokenizer(text, **kwargs)
     
     def _predict_proba_wrapper(self, texts: List[str]) -> np.ndarray:
         """
         Wrapper function for SHAP that returns probabilities
+        Rows for texts seen before come from an LRU cache; the rest run in
+        batched forward passes over sub-batches of XAI_BATCH_SIZE texts
         
         Args:
             texts: List of text strings
@@ -44,133 +161,425 @@ class XAIService:
         Returns:
             Numpy array of probabilities [batch_size, 2]
         """
-        predictions = []
+        keys = [_proba_key(text) for text in texts]
+        rows = [self._proba_cache.get(key) for key in keys]
         
-        for text in texts:
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                truncation=True,
-                max_length=settings.MAX_TEXT_LENGTH,
-                padding=True
-            )
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        uncached = [i for i, row in enumerate(rows) if row is None]
+        if uncached:
+            uncached_texts = [texts[i] for i in uncached]
+            if self._get_shap_model() is self.model:
+                # Compiled model - run on the model service's forward thread
+                probs = self.model_service.run_compiled(self._forward_probs, uncached_texts)
+            else:
+                probs = self._forward_probs(uncached_texts)
             
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-                predictions.append(probs.cpu().numpy()[0])
+            for i, row in zip(uncached, probs):
+                rows[i] = row
+                self._proba_cache[keys[i]] = row
         
-        return np.array(predictions)
+        if uncached:
+            logger.debug("SHAP batch: %d/%d cached", len(texts) - len(uncached), len(texts))
+        return np.stack(rows)
+    
+    def _forward_probs(self, texts: List[str]) -> np.ndarray:
+        """
+        SHAP model probabilities for texts, in sub-batches of XAI_BATCH_SIZE
+        """
+        # Softmax stays on the device; one host transfer for all sub-batches
+        model = self._get_shap_model()
+        with torch.inference_mode():
+            device_probs = []
+            for start in range(0, len(texts), settings.XAI_BATCH_SIZE):
+                inputs = self.model_service.tokenize(texts[start:start + settings.XAI_BATCH_SIZE])
+                outputs = model(**inputs)
+                device_probs.append(torch.nn.functional.softmax(outputs.logits.float(), dim=-1))
+            return torch.cat(device_probs).cpu().numpy()
     
     def get_word_importance(
         self, 
         combined_text: str, 
         predicted_class: int,
-        top_n: int = 15
+        top_n: int = 15,
+        words: Optional[List[str]] = None,
+        probabilities: Optional[List[float]] = None
     ) -> List[Dict]:
         """
-        Get word importance using SHAP (FIXED VERSION)
+        Get word importance for the predicted class (FIXED VERSION)
+        Uses integrated gradients, SHAP or the distilled SHAP head
+        depending on XAI_METHOD
         
         Args:
             combined_text: Combined title + text
             predicted_class: 0 for Fake, 1 for Real
             top_n: Number of top words to return
+            words: combined_text already split into words (split here if None)
+            probabilities: [fake, real] from the main prediction, reused by
+                SHAP as its unmasked evaluation when it runs the same model
             
         Returns:
             List of word importance dictionaries
         """
         try:
             start_time = time.time()
-            logger.info("Starting SHAP analysis...")
+            logger.debug("Starting %s analysis...", settings.XAI_METHOD)
+            
+            if settings.XAI_METHOD == "distilled" and self._get_attribution_head() is not None:
+                scored_words, values = self._distilled_values(combined_text, predicted_class, words=words)
+            elif settings.XAI_METHOD in ("shap", "distilled"):
+                scored_words, values = self._shap_values(
+                    combined_text, predicted_class, words=words, probabilities=probabilities
+                )
+            else:
+                scored_words, values = self._integrated_gradients_values(combined_text, predicted_class)
             
-            # Create masker and explainer
-            masker = shap.maskers.Text(self.tokenizer)
-            explainer = shap.Explainer(
-                self._predict_proba_wrapper, 
-                masker,
+            top_words = self._rank_words(scored_words, values, predicted_class, top_n)
+            
+            xai_time = (time.time() - start_time) * 1000
+            logger.debug("%s analysis completed in %.0fms", settings.XAI_METHOD, xai_time)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Top 3 words: %s", [w['word'] for w in top_words[:3]])
+            
+            return top_words
+            
+        except Exception as e:
+            logger.error(f"{settings.XAI_METHOD} analysis failed: {str(e)}", exc_info=True)
+            # Return fallback word importance based on common patterns
+            return self._get_fallback_word_importance(combined_text, predicted_class, words=words)
+    
+    def _get_shap_model(self):
+        """
+        Model used for SHAP's many masked forwards
+        On CPU (with XAI_QUANTIZE) an int8 dynamically quantized copy of the
+        Linear layers - attribution tolerates the small drift; the prediction
+        endpoint keeps the full-precision model. On GPU the model already
+        runs in bf16, so it is shared as is
+        """
+        if self._shap_model is None:
+            # Own lock (not _explainer_lock, which callers may already hold):
+            # quantize_dynamic deep-copies the model, so build it only once
+            with self._shap_model_lock:
+                if self._shap_model is None:
+                    if settings.XAI_QUANTIZE and self.device.type == "cpu":
+                        self._shap_model = torch.ao.quantization.quantize_dynamic(
+                            self.model_service.eager_model,
+                            {torch.nn.Linear},
+                            dtype=torch.qint8
+                        )
+                        logger.info("SHAP model quantized to int8 (dynamic)")
+                    else:
+                        self._shap_model = self.model
+        return self._shap_model
+    
+    def _get_explainer(self):
+        """
+        Build the SHAP text masker and explainer once (the tokenizer loads lazily)
+        """
+        if self._explainer is None:
+            shap = _import_shap()
+            # Runs of masked tokens collapse into one mask token, so masked
+            # variants are shorter and repeat more often (proba cache hits)
+            # The masker tokenizes every masked variant with its own
+            # settings, so it gets a private copy of the tokenizer
+            with self.model_service.tokenizer_lock:
+                masker_tokenizer = copy.deepcopy(self.tokenizer)
+            self._masker = shap.maskers.Text(
+                masker_tokenizer,
+                mask_token=masker_tokenizer.mask_token,
+                collapse_mask_token=True
+            )
+            self._explainer = shap.explainers.Permutation(
+                self._predict_proba_wrapper,
+                self._masker,
                 output_names=["Fake", "Real"]
             )
+        return self._explainer
+    
+    def _shap_values(
+        self,
+        combined_text: str,
+        predicted_class: int,
+        words: Optional[List[str]] = None,
+        probabilities: Optional[List[float]] = None
+    ) -> Tuple[List[str], List[float]]:
+        """
+        SHAP values of the first 30 words for the predicted class
+        (token values summed per word)
+        """
+        # Explain only the words we report, so the token count M stays small
+        if words is None:
+            words = TextPreprocessor.tokenize_words(combined_text)
+        words = words[:SHAP_MAX_WORDS]
+        
+        text = " ".join(words)
+        
+        # The unmasked evaluation is the main prediction when nothing was cut
+        # and SHAP runs the same model - Permutation SHAP credits f(x) to the
+        # tokens at each permutation's end, so an fp32 f(x) next to int8
+        # masked forwards would skew their values
+        if (
+            probabilities is not None
+            and text == combined_text
+            and self._get_shap_model() is self.model
+        ):
+            with self._explainer_lock:
+                self._proba_cache[_proba_key(text)] = np.asarray(probabilities, dtype=np.float32)
+        shap_values = self.explain_tokens(text)
+        
+        # Extract token SHAP values for the PREDICTED class
+        # CRITICAL FIX: Use predicted_class to get correct importance values
+        token_values = shap_values.values[0][:, predicted_class]
+        
+        # Values are per tokenizer token; the masker's token strings
+        # (shap_values.data) tile the text, which gives each token's span
+        segments = shap_values.data[0]
+        if "".join(segments) != text:
+            logger.warning("SHAP token segments don't match the text, pairing by position")
+            return words, token_values[:len(words)]
+        
+        offsets = []
+        position = 0
+        for segment in segments:
+            leading = len(segment) - len(segment.lstrip())
+            offsets.append((position + leading, position + len(segment)))
+            position += len(segment)
+        
+        # Empty segments are the special tokens (<s>, </s>)
+        special_mask = [not segment for segment in segments]
+        return _aggregate_to_words(text, offsets, token_values.tolist(), special_mask)
+    
+    def explain_tokens(self, text: str):
+        """
+        Run the Permutation explainer on one text
+        Also produces the training targets for the distilled attribution head
+        
+        Args:
+            text: Text to explain (kept short - cost grows with its tokens)
             
-            # Generate SHAP values
-            shap_values = explainer([combined_text], max_evals=100)
-            
-            # Extract words and their SHAP values for the PREDICTED class
-            # CRITICAL FIX: Use predicted_class to get correct importance values
-            words = combined_text.split()[:30]  # First 30 words for efficiency
-            shap_vals = shap_values.values[0][:len(words), predicted_class]
-            
-            # Create word importance list
-            word_importance = []
-            for word, shap_val in zip(words, shap_vals):
-                # Determine direction based on SHAP value
-                # Negative values push toward Fake (class 0)
-                # Positive values push toward Real (class 1)
-                if predicted_class == 0:  # Predicted Fake
-                    # For Fake prediction, negative values support prediction
-                    direction = "fake" if shap_val < 0 else "real"
-                else:  # Predicted Real
-                    # For Real prediction, positive values support prediction
-                    direction = "real" if shap_val > 0 else "fake"
-                
-                word_importance.append({
-                    "word": word,
-                    "importance": float(abs(shap_val)),
-                    "direction": direction,
-                    "shap_value": float(shap_val)
-                })
+        Returns:
+            shap.Explanation with values [1, tokens, 2]
+        """
+        # Permutation explainer: each permutation costs ~2*(M+1) model calls,
+        # so the budget buys exactly XAI_SHAP_PERMUTATIONS permutations
+        num_tokens = len(self._tokenize(text, add_special_tokens=False)["input_ids"])
+        max_evals = 2 * (num_tokens + 1) * settings.XAI_SHAP_PERMUTATIONS
+        
+        # Generate SHAP values - the shared explainer is not thread-safe
+        with self._explainer_lock:
+            return self._get_explainer()([text], max_evals=max_evals)
+    
+    def _get_attribution_head(self) -> Optional[AttributionHead]:
+        """
+        Load the distilled attribution head once (None if unavailable)
+        """
+        if self._head is None and not self._head_failed:
+            try:
+                self._head = load_attribution_head(
+                    settings.XAI_HEAD_PATH,
+                    hidden_size=self.model_service.eager_model.config.hidden_size,
+                    device=self.device
+                )
+                logger.info(f"Distilled attribution head loaded: {settings.XAI_HEAD_PATH}")
+            except Exception as e:
+                logger.warning(f"Attribution head unavailable, using SHAP: {str(e)}")
+                self._head_failed = True
+        return self._head
+    
+    def _distilled_values(
+        self,
+        combined_text: str,
+        predicted_class: int,
+        words: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[float]]:
+        """
+        Predicted SHAP values for the first 30 words from one forward pass
+        through the model and the distilled attribution head
+        """
+        # Same window the head's SHAP targets were computed on
+        if words is None:
+            words = TextPreprocessor.tokenize_words(combined_text)
+        text = " ".join(words[:SHAP_MAX_WORDS])
+        
+        inputs = self._tokenize(
+            text,
+            return_tensors="pt",
+            truncation=True,
+            max_length=settings.MAX_TEXT_LENGTH,
+            return_offsets_mapping=True
+        )
+        offsets = inputs.pop("offset_mapping")[0].tolist()
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        special = torch.isin(inputs["input_ids"], torch.tensor(self.tokenizer.all_special_ids, device=self.device))
+        
+        with torch.inference_mode():
+            outputs = self.model_service.eager_model(**inputs, output_hidden_states=True)
+            token_values = self._get_attribution_head()(outputs.hidden_states[-1][0].float())
+        
+        token_scores = token_values[:, predicted_class].cpu().tolist()
+        return _aggregate_to_words(text, offsets, token_scores, special[0].tolist())
+    
+    def _get_integrated_gradients(self) -> IntegratedGradients:
+        """
+        Build the integrated-gradients explainer on first use
+        Attributes w.r.t. the input embeddings of the eager (uncompiled) model;
+        passing inputs_embeds needs no module hooks, so batched predictions
+        on the same model are unaffected
+        """
+        if self._ig is None:
+            model = self.model_service.eager_model
             
-            # Sort by absolute importance
-            word_importance.sort(key=lambda x: x['importance'], reverse=True)
+            def forward(inputs_embeds, attention_mask):
+                logits = model(inputs_embeds=inputs_embeds, attention_mask=attention_mask).logits
+                return torch.nn.functional.softmax(logits.float(), dim=-1)
             
-            # Return top N
-            top_words = word_importance[:top_n]
+            self._ig = IntegratedGradients(forward)
+        return self._ig
+    
+    def _integrated_gradients_values(self, combined_text: str, predicted_class: int) -> Tuple[List[str], List[float]]:
+        """
+        Integrated gradients (XAI_IG_STEPS steps, one batched forward+backward)
+        from a padding baseline, summed per word
+        """
+        inputs = self._tokenize(
+            combined_text,
+            return_tensors="pt",
+            truncation=True,
+            max_length=settings.MAX_TEXT_LENGTH,
+            return_offsets_mapping=True
+        )
+        offsets = inputs.pop("offset_mapping")[0].tolist()
+        input_ids = inputs["input_ids"].to(self.device)
+        attention_mask = inputs["attention_mask"].to(self.device)
+        
+        # Baseline keeps special tokens and replaces everything else with <pad>
+        special = torch.isin(input_ids, torch.tensor(self.tokenizer.all_special_ids, device=self.device))
+        baseline_ids = torch.where(special, input_ids, torch.full_like(input_ids, self.tokenizer.pad_token_id))
+        
+        embeddings = self.model_service.eager_model.get_input_embeddings()
+        with torch.no_grad():
+            input_embeds = embeddings(input_ids)
+            baseline_embeds = embeddings(baseline_ids)
+        
+        attributions = self._get_integrated_gradients().attribute(
+            inputs=input_embeds,
+            baselines=baseline_embeds,
+            additional_forward_args=(attention_mask,),
+            target=predicted_class,
+            n_steps=settings.XAI_IG_STEPS,
+            internal_batch_size=settings.XAI_IG_STEPS
+        )
+        
+        token_scores = attributions.sum(dim=-1)[0].float().cpu().tolist()
+        return _aggregate_to_words(combined_text, offsets, token_scores, special[0].tolist())
+    
+    def _rank_words(self, words: List[str], values, predicted_class: int, top_n: int) -> List[Dict]:
+        """
+        Build the word importance list for the top N words by magnitude
+        values are attributions toward predicted_class (IG, SHAP, distilled
+        and attention all target it): positive supports the prediction
+        """
+        values = np.asarray(values, dtype=np.float64)[:len(words)]
+        importance = np.abs(values)
+        
+        # Top N by absolute importance (stable, ties keep text order)
+        top = np.argsort(-importance, kind="stable")[:top_n]
+        
+        # Positive values support the predicted class, negative the other
+        predicted, other = ("fake", "real") if predicted_class == 0 else ("real", "fake")
+        directions = np.where(values[top] > 0, predicted, other)
+        
+        return [
+            {
+                "word": words[i],
+                "importance": float(importance[i]),
+                "direction": str(direction),
+                "shap_value": float(values[i])
+            }
+            for i, direction in zip(top.tolist(), directions)
+        ]
+    
+    def get_attention_importance(
+        self,
+        combined_text: str,
+        predicted_class: int,
+        top_n: int = 15,
+        words: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        Cheap word importance from last-layer <s> attention (one forward pass,
+        no gradients) for high-confidence predictions that skip attribution
+        Attention has no sign, so every word is credited to the predicted class
+        
+        Args:
+            combined_text: Combined title + text
+            predicted_class: 0 for Fake, 1 for Real
+            top_n: Number of top words to return
+            words: combined_text already split into words (split here if None)
             
-            xai_time = (time.time() - start_time) * 1000
-            logger.info(f"SHAP analysis completed in {xai_time:.0f}ms")
-            logger.info(f"Top 3 words: {[w['word'] for w in top_words[:3]]}")
+        Returns:
+            List of word importance dictionaries
+        """
+        try:
+            inputs = self._tokenize(
+                combined_text,
+                return_tensors="pt",
+                truncation=True,
+                max_length=settings.MAX_TEXT_LENGTH,
+                return_offsets_mapping=True
+            )
+            offsets = inputs.pop("offset_mapping")[0].tolist()
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            special = torch.isin(inputs["input_ids"], torch.tensor(self.tokenizer.all_special_ids, device=self.device))
             
-            return top_words
+            with torch.inference_mode():
+                outputs = self.model_service.eager_model(**inputs, output_attentions=True)
+            
+            # Attention from <s> (the classification token), averaged over heads
+            token_scores = outputs.attentions[-1][0, :, 0, :].float().mean(dim=0).cpu().tolist()
+            scored_words, scores = _aggregate_to_words(combined_text, offsets, token_scores, special[0].tolist())
+            
+            return self._rank_words(scored_words, scores, predicted_class, top_n)
             
         except Exception as e:
-            logger.error(f"SHAP analysis failed: {str(e)}", exc_info=True)
-            # Return fallback word importance based on common patterns
-            return self._get_fallback_word_importance(combined_text, predicted_class)
+            logger.error(f"Attention word importance failed: {str(e)}", exc_info=True)
+            return self._get_fallback_word_importance(combined_text, predicted_class, words=words)
     
     def _get_fallback_word_importance(
         self, 
         text: str, 
-        predicted_class: int
+        predicted_class: int,
+        words: Optional[List[str]] = None
     ) -> List[Dict]:
         """
-        Fallback word importance if SHAP fails
+        Fallback word importance if attribution fails
         Uses predefined fake/real indicator words
         """
-        logger.warning("Using fallback word importance (SHAP failed)")
-        
-        fake_indicators = [
-            'shocking', 'breaking', 'revealed', 'secret', 'conspiracy',
-            'amazing', 'unbelievable', 'miracle', 'doctors hate', 'they',
-            'delete', 'share', 'before', 'anonymous', 'sources'
-        ]
+        logger.warning("Using fallback word importance (attribution failed)")
         
-        real_indicators = [
-            'according', 'reuters', 'reported', 'official', 'announced',
-            'study', 'research', 'data', 'government', 'experts'
-        ]
-        
-        words = text.lower().split()[:30]
+        if words is None:
+            words = TextPreprocessor.tokenize_words(text)
+        words = [w.lower() for w in words[:30]]
         word_importance = []
         
+        # Two-word indicators ('doctors hate') can't match a single token
+        for first, second in zip(words, words[1:]):
+            bigram = f"{first} {second}"
+            if bigram in _FAKE_INDICATORS:
+                word_importance.append({
+                    "word": bigram,
+                    "importance": 0.7,
+                    "direction": "fake",
+                    "shap_value": -0.7
+                })
+        
         for word in words:
-            if word in fake_indicators:
+            if word in _FAKE_INDICATORS:
                 word_importance.append({
                     "word": word,
                     "importance": 0.7,
                     "direction": "fake",
                     "shap_value": -0.7
                 })
-            elif word in real_indicators:
+            elif word in _REAL_INDICATORS:
                 word_importance.append({
                     "word": word,
                     "importance": 0.6,
@@ -5,5 +5,6 @@ Utils package initialization
 from app.utils.preprocessing import TextPreprocessor
 from app.utils.logger import setup_logger
 from app.utils.aws_utils import DynamoDBService
+from app.utils.timestamps import iso_now
 
-__all__ = ['TextPreprocessor', 'setup_logger', 'DynamoDBService']
+__all__ = ['TextPreprocessor', 'setup_logger', 'DynamoDBService', 'iso_now']
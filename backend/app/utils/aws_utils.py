@@ -4,18 +4,60 @@ UPDATED: Fixed Float to Decimal conversion
 """
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from datetime import datetime
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional
 from decimal import Decimal  # ← ADDED
+import asyncio
+import atexit
+import time
 import uuid
 
-from app.config import get_settings
+from app.config import SETTINGS as settings
 from app.utils.logger import setup_logger
+from app.utils.timestamps import iso_now
 
-settings = get_settings()
 logger = setup_logger(__name__)
 
+# DynamoDB BatchWriteItem accepts at most 25 put requests per call
+BATCH_WRITE_LIMIT = 25
+
+# Error codes worth retrying with backoff
+THROTTLING_ERRORS = frozenset({
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+})
+
+# Pooled connections with TCP keep-alive, bounded timeouts and adaptive retries
+BOTO_CONFIG = Config(
+    max_pool_connections=max(64, settings.WORKERS * 4),
+    connect_timeout=2,
+    read_timeout=5,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    tcp_keepalive=True
+)
+
+
+@lru_cache()
+def get_boto3_session() -> boto3.session.Session:
+    """
+    Process-wide boto3 session (credential resolution happens once)
+    """
+    return boto3.session.Session(
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None
+    )
+
+
+def _to_decimal(value: float) -> Decimal:
+    """
+    Float -> Decimal via its shortest repr (Decimal(float) keeps binary noise)
+    """
+    return Decimal(str(value))
+
 
 def convert_floats_to_decimal(obj):
     """
@@ -41,6 +83,14 @@ def convert_floats_to_decimal(obj):
         return obj
 
 
+def _convert_highlight(highlight: Dict) -> Dict:
+    """
+    Copy of a flat word highlight dict with float values as Decimal
+    """
+    # isinstance, not type() - np.float64 subclasses float
+    return {k: _to_decimal(v) if isinstance(v, float) else v for k, v in highlight.items()}
+
+
 class DynamoDBService:
     """
     DynamoDB service for logging predictions
@@ -51,17 +101,157 @@ class DynamoDBService:
         Initialize DynamoDB client
         """
         try:
-            self.dynamodb = boto3.resource(
-                'dynamodb',
-                region_name=settings.AWS_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None
-            )
+            self.dynamodb = get_boto3_session().resource('dynamodb', config=BOTO_CONFIG)
             self.table = self.dynamodb.Table(settings.DYNAMODB_TABLE_NAME)
             logger.info(f"DynamoDB initialized: {settings.DYNAMODB_TABLE_NAME}")
         except Exception as e:
             logger.error(f"DynamoDB initialization failed: {str(e)}")
             self.table = None
+        
+        # Background batch writer state (see start/stop)
+        self._queue = None
+        self._writer_task = None
+        # Direct writes scheduled by log_prediction_async without a writer
+        self._direct_tasks = set()
+        atexit.register(self._flush_at_exit)
+    
+    async def start(self):
+        """
+        Start the background batch writer (called from app lifespan)
+        """
+        if self.table is None or self._writer_task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.DYNAMODB_QUEUE_SIZE)
+        self._writer_task = asyncio.create_task(self._batch_writer())
+        logger.info("DynamoDB batch writer started")
+    
+    async def stop(self):
+        """
+        Stop the batch writer and flush any queued items
+        """
+        if self._writer_task is None:
+            return
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        self._writer_task = None
+        
+        if self._direct_tasks:
+            await asyncio.gather(*self._direct_tasks, return_exceptions=True)
+        flushed = await self.flush()
+        self._queue = None
+        logger.info(f"DynamoDB batch writer stopped ({flushed} items flushed)")
+    
+    async def flush(self) -> int:
+        """
+        Write everything currently queued right away
+        
+        Returns:
+            Number of items flushed
+        """
+        if self._queue is None:
+            return 0
+        
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for i in range(0, len(pending), BATCH_WRITE_LIMIT):
+            await asyncio.to_thread(self._write_batch, pending[i:i + BATCH_WRITE_LIMIT])
+        return len(pending)
+    
+    def _flush_at_exit(self):
+        """
+        Last-chance synchronous flush if the process exits without the
+        lifespan shutdown running stop()
+        """
+        if self._queue is None or self._queue.empty():
+            return
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for i in range(0, len(pending), BATCH_WRITE_LIMIT):
+            self._write_batch(pending[i:i + BATCH_WRITE_LIMIT])
+    
+    async def _batch_writer(self):
+        """
+        Group queued items into batch writes of up to 25 items,
+        flushing at least every DYNAMODB_FLUSH_INTERVAL_S seconds
+        """
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + settings.DYNAMODB_FLUSH_INTERVAL_S
+            
+            try:
+                while len(batch) < BATCH_WRITE_LIMIT:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Shutting down mid-collection - don't lose the partial batch
+                await asyncio.to_thread(self._write_batch, batch)
+                raise
+            
+            await asyncio.to_thread(self._write_batch, batch)
+    
+    def _write_batch(self, items: List[Dict]) -> bool:
+        """
+        Write items through the table's batch_writer (which resubmits
+        UnprocessedItems), backing off exponentially when throttled
+        
+        Args:
+            items: Up to 25 DynamoDB items
+            
+        Returns:
+            True if all items were written, False otherwise
+        """
+        for attempt in range(settings.DYNAMODB_MAX_RETRIES + 1):
+            try:
+                # Puts are keyed by id, so retrying a partly written batch is safe
+                with self.table.batch_writer(overwrite_by_pkeys=['id']) as writer:
+                    for item in items:
+                        writer.put_item(Item=item)
+                logger.debug("Logged %d predictions to DynamoDB", len(items))
+                return True
+                
+            except ClientError as e:
+                error_code = e.response.get('Error', {}).get('Code')
+                if error_code in THROTTLING_ERRORS and attempt < settings.DYNAMODB_MAX_RETRIES:
+                    delay = 0.1 * (2 ** attempt)
+                    logger.warning(f"DynamoDB throttled ({error_code}), retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                logger.error(f"DynamoDB batch write failed: {str(e)}", exc_info=True)
+                return False
+            except Exception as e:
+                logger.error(f"Unexpected error in DynamoDB batch write: {str(e)}", exc_info=True)
+                return False
+        
+        return False
+    
+    async def log_prediction_async(self, **kwargs):
+        """
+        Log a prediction from the event loop without waiting on DynamoDB
+        Enqueues for the batch writer (microseconds); if the writer isn't
+        running, the direct put_item runs in a tracked background task
+        
+        Args:
+            Same as log_prediction
+        """
+        if self._queue is not None:
+            self.log_prediction(**kwargs)
+            return
+        
+        task = asyncio.create_task(asyncio.to_thread(self.log_prediction, **kwargs))
+        self._direct_tasks.add(task)
+        task.add_done_callback(self._direct_tasks.discard)
     
     def log_prediction(
         self,
@@ -75,7 +265,8 @@ class DynamoDBService:
         processing_time_ms: float
     ) -> bool:
         """
-        Log prediction to DynamoDB
+        Queue prediction for DynamoDB logging (non-blocking)
+        Oldest queued item is dropped if the queue is full
         
         Args:
             request_id: Unique request ID
@@ -88,7 +279,7 @@ class DynamoDBService:
             processing_time_ms: Processing time
             
         Returns:
-            True if successful, False otherwise
+            True if queued (or written), False otherwise
         """
         if not self.table:
             logger.warning("DynamoDB not configured, skipping logging")
@@ -97,22 +288,29 @@ class DynamoDBService:
         try:
             item = {
                 'id': request_id,
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': iso_now(),
                 'title': title[:500],  # Truncate long titles
                 'text_preview': text[:200],  # Store preview only
                 'prediction': prediction,
-                'confidence': confidence,
-                'word_highlights': word_highlights[:10],  # Top 10 words
+                # Floats must be Decimal for DynamoDB (CRITICAL FIX) - the
+                # schema is known, so convert just these fields
+                'confidence': _to_decimal(confidence),
+                'word_highlights': [_convert_highlight(w) for w in word_highlights[:10]],  # Top 10 words
                 'explanation': explanation,
-                'processing_time_ms': processing_time_ms,
+                'processing_time_ms': _to_decimal(processing_time_ms),
                 'input_type': 'text'
             }
             
-            # Convert all floats to Decimal (CRITICAL FIX)
-            item = convert_floats_to_decimal(item)
+            if self._queue is None:
+                # Batch writer not running (outside the app lifespan) - write directly
+                self.table.put_item(Item=item)
+                logger.debug("Logged prediction to DynamoDB: %s", request_id)
+                return True
             
-            self.table.put_item(Item=item)
-            logger.info(f"Logged prediction to DynamoDB: {request_id}")
+            if self._queue.full():
+                dropped = self._queue.get_nowait()
+                logger.warning(f"DynamoDB queue full, dropping oldest item: {dropped['id']}")
+            self._queue.put_nowait(item)
             return True
             
         except ClientError as e:
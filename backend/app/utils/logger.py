@@ -5,16 +5,58 @@ Includes file and console logging with JSON formatting
 
 import logging
 import sys
+import threading
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from pythonjsonlogger import jsonlogger
-from app.config import get_settings
+from app.config import SETTINGS as settings
 
-settings = get_settings()
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _configure_root_logger():
+    """
+    Attach the console and file handlers to the root logger (once per process)
+    Module loggers propagate to it, so there is a single open log file
+    """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        
+        root = logging.getLogger()
+        
+        # Console Handler with JSON formatting
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(jsonlogger.JsonFormatter(
+            '%(asctime)s %(name)s %(levelname)s %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        root.addHandler(console_handler)
+        
+        # Rotating File Handler with JSON formatting
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        
+        file_handler = RotatingFileHandler(
+            log_dir / settings.LOG_FILE,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT
+        )
+        file_handler.setFormatter(jsonlogger.JsonFormatter(
+            '%(asctime)s %(name)s %(levelname)s %(message)s %(pathname)s %(lineno)d',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        root.addHandler(file_handler)
+        
+        _configured = True
 
 
 def setup_logger(name: str) -> logging.Logger:
     """
     Setup professional logger with file and console handlers
+    Handlers live on the root logger; this only sets the level
     
     Args:
         name: Logger name (usually __name__)
@@ -22,34 +64,10 @@ def setup_logger(name: str) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    _configure_root_logger()
+    
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, settings.LOG_LEVEL))
-    
-    # Avoid duplicate handlers
-    if logger.handlers:
-        return logger
-    
-    # Console Handler with JSON formatting
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_formatter = jsonlogger.JsonFormatter(
-        '%(asctime)s %(name)s %(levelname)s %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # File Handler with JSON formatting
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    file_handler = logging.FileHandler(log_dir / settings.LOG_FILE)
-    file_formatter = jsonlogger.JsonFormatter(
-        '%(asctime)s %(name)s %(levelname)s %(message)s %(pathname)s %(lineno)d',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
     return logger
 
 
@@ -3,10 +3,16 @@ Text Preprocessing Utilities
 """
 
 import re
+from typing import List, Optional
+
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Compiled once at import
+_WS_RE = re.compile(r'\s+')
+_STRIP_RE = re.compile(r'[^\w\s.,!?;:\'-]+')
+
 
 class TextPreprocessor:
     """
@@ -26,15 +32,16 @@ class TextPreprocessor:
         """
         try:
             # Remove extra whitespace
-            text = re.sub(r'\s+', ' ', text)
+            text = _WS_RE.sub(' ', text)
             
             # Remove special characters but keep punctuation
-            text = re.sub(r'[^\w\s.,!?;:\'-]', '', text)
+            # (runs of them in one match)
+            text = _STRIP_RE.sub('', text)
             
             # Strip leading/trailing whitespace
             text = text.strip()
             
-            logger.debug(f"Text cleaned: length={len(text)}")
+            logger.debug("Text cleaned: length=%d", len(text))
             return text
             
         except Exception as e:
@@ -42,7 +49,12 @@ class TextPreprocessor:
             return text
     
     @staticmethod
-    def combine_title_text(title: str, text: str, separator: str = " </s> ") -> str:
+    def combine_title_text(
+        title: str,
+        text: str,
+        separator: str = " </s> ",
+        max_words: Optional[int] = None
+    ) -> str:
         """
         Combine title and text with separator token
         
@@ -50,23 +62,43 @@ class TextPreprocessor:
             title: Article title
             text: Article content
             separator: Separator token (RoBERTa uses </s>)
+            max_words: Keep only the first max_words words of text,
+                dropped before cleaning so cost scales with the output
             
         Returns:
             Combined text
         """
         try:
+            if max_words is not None:
+                # maxsplit stops scanning after max_words words
+                text = ' '.join(text.split(maxsplit=max_words)[:max_words])
+            
             cleaned_title = TextPreprocessor.clean_text(title)
             cleaned_text = TextPreprocessor.clean_text(text)
             
             combined = f"{cleaned_title}{separator}{cleaned_text}"
             
-            logger.debug(f"Combined title+text: length={len(combined)}")
+            logger.debug("Combined title+text: length=%d", len(combined))
             return combined
             
         except Exception as e:
             logger.error(f"Error combining title and text: {str(e)}")
             return f"{title} {text}"
     
+    @staticmethod
+    def tokenize_words(text: str) -> List[str]:
+        """
+        Split text into whitespace-separated words (done once per request
+        and shared by the XAI stages)
+        
+        Args:
+            text: Text to split
+            
+        Returns:
+            List of words
+        """
+        return text.split()
+    
     @staticmethod
     def truncate_text_for_llm(text: str, max_words: int = 150) -> str:
         """
@@ -79,10 +111,12 @@ class TextPreprocessor:
         Returns:
             Truncated text
         """
-        words = text.split()
+        # maxsplit stops scanning once max_words words are found; a leftover
+        # element means there was more text
+        words = text.split(maxsplit=max_words)
         if len(words) <= max_words:
             return text
         
         truncated = ' '.join(words[:max_words]) + "..."
-        logger.debug(f"Text truncated for LLM: {len(words)} -> {max_words} words")
+        logger.debug("Text truncated for LLM: %d words kept", max_words)
         return truncated
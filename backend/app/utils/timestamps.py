@@ -0,0 +1,17 @@
+"""
+Fast Timestamp Formatting
+"""
+
+import time
+
+
+def iso_now() -> str:
+    """
+    Current UTC time in ISO 8601 format
+    Same output as datetime.utcnow().isoformat() without building a datetime
+    
+    Returns:
+        Timestamp string, e.g. "2024-01-01T12:00:00.123456"
+    """
+    t = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int((t % 1) * 1e6):06d}"